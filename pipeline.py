@@ -1,10 +1,10 @@
 import os
 import logging
-import networkx as nx
 from dotenv import load_dotenv
 from scripts.fetch_data import fetch_google_trends_data, fetch_reddit_data, fetch_hacker_news_data
 from scripts.process_data import process_google_trends, process_reddit, process_hacker_news
 from scripts.build_graph import build_knowledge_graph as build_kg, save_graph
+from scripts.compact_graph import CompactGraph
 
 # Load environment variables from .env file
 load_dotenv()
@@ -63,7 +63,7 @@ def process_data():
 # Step 3: Build Knowledge Graph
 def build_and_save_knowledge_graph():
     try:
-        graph = nx.Graph()
+        graph = CompactGraph()
         build_kg(graph)
         save_graph(graph)
         logging.info("Knowledge graph built and saved successfully.")
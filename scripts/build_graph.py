@@ -3,6 +3,7 @@ import networkx as nx
 import pandas as pd
 import logging
 from pathlib import Path
+from scripts.compact_graph import CompactGraph
 
 # Initialize logging
 logging.basicConfig(filename='./logs/build_graph.log', level=logging.INFO)
@@ -14,46 +15,69 @@ def get_data_path(data_type):
 
 PROCESSED_DATA_PATH = get_data_path('processed')
 
-def add_nodes_and_edges(graph, data, category):
+def _add_edge(graph, u, v, relation, degree_index=None):
+    is_new = degree_index is not None and not graph.has_edge(u, v)
+    graph.add_edge(u, v, relation=relation)
+    if is_new:
+        degree_index.add_edge(u, v)
+
+def _add_node(graph, node, category, degree_index=None):
+    graph.add_node(node, category=category)
+    if degree_index is not None:
+        degree_index.add_node(node)
+
+def add_nodes_and_edges(graph, data, category, degree_index=None):
     """
     Add nodes and edges to the graph based on the collected data.
+    If a degree index is given, node degrees are updated as edges are added.
     """
     if data is not None:
         for index, row in data.iterrows():
+            if 'title' in row and pd.isna(row['title']):
+                logging.warning(f"Skipping row {index} without a title.")
+                continue
             if 'title' in row:
                 title = row['title']
-                graph.add_node(title, category=category)
+                _add_node(graph, title, category, degree_index)
                 if 'keywords' in row:
                     keywords = row['keywords'].split(',')
                     for keyword in keywords:
-                        graph.add_node(keyword, category='Keyword')
-                        graph.add_edge(title, keyword, relation='Contains')
+                        _add_node(graph, keyword, 'Keyword', degree_index)
+                        _add_edge(graph, title, keyword, 'Contains', degree_index)
                 if 'entities' in row:
                     entities = row['entities']
                     for entity in entities:
-                        graph.add_node(entity, category='Entity')
-                        graph.add_edge(title, entity, relation='Mentions')
+                        _add_node(graph, entity, 'Entity', degree_index)
+                        _add_edge(graph, title, entity, 'Mentions', degree_index)
             if 'subreddit' in row:
                 subreddit = row['subreddit']
-                graph.add_node(subreddit, category='Subreddit')
-                graph.add_edge(subreddit, title, relation='Discusses')
+                _add_node(graph, subreddit, 'Subreddit', degree_index)
+                _add_edge(graph, subreddit, title, 'Discusses', degree_index)
 
-def build_knowledge_graph(graph):
+def build_knowledge_graph(graph, degree_index=None):
     sources = ['google_trends', 'reddit', 'hacker_news', 'stackoverflow', 'dev_to', 'product_hunt']
     for source in sources:
         files = [f for f in os.listdir(PROCESSED_DATA_PATH) if f.startswith(f'processed_{source}')]
         for file in files:
             logging.info(f"Processing file: {file}")
             df = pd.read_csv(os.path.join(PROCESSED_DATA_PATH, file))
-            add_nodes_and_edges(graph, df, source)
-    logging.info(f"Graph built with {len(graph.nodes())} nodes and {len(graph.edges())} edges.")
+            add_nodes_and_edges(graph, df, source, degree_index)
+    logging.info(f"Graph built with {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges.")
 
-def save_graph(graph, path='./data/processed/knowledge_graph.gexf'):
-    nx.write_gexf(graph, path)
+def save_graph(graph, path='./data/processed/knowledge_graph.npz'):
+    """
+    Saves the graph as a compact .npz archive, or as GEXF through the networkx view.
+    """
+    if str(path).endswith('.npz'):
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        graph.save(path)
+    else:
+        nx.write_gexf(graph.to_networkx() if isinstance(graph, CompactGraph) else graph, path)
     logging.info(f"Knowledge graph saved to {path}.")
 
 # Example usage
 if __name__ == "__main__":
-    graph = nx.Graph()
+    graph = CompactGraph()
     build_knowledge_graph(graph)
     save_graph(graph)
\ No newline at end of file
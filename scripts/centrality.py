@@ -0,0 +1,311 @@
+import heapq
+import logging
+import math
+import random
+import time
+from collections import defaultdict
+import numpy as np
+import scipy.sparse as sp
+from scripts.compact_graph import CompactGraph
+
+logger = logging.getLogger(__name__)
+
+# Approximate peak bytes per (node, source) cell of a betweenness batch, counting
+# the dense sigma/dist/delta matrices and the per-level sparse products
+BATCH_BYTES_PER_CELL = 64
+MAX_BATCH_SIZE = 64
+
+def _category_filter(graph, categories):
+    """
+    Returns a predicate that keeps nodes whose 'category' attribute is in categories.
+    """
+    if categories is None:
+        return None
+    if isinstance(categories, str):
+        categories = {categories}
+    categories = set(categories)
+    if isinstance(graph, CompactGraph):
+        return lambda node: graph.category(node) in categories
+    return lambda node: graph.nodes[node].get('category') in categories
+
+def top_k(scores, k=10, graph=None, categories=None):
+    """
+    Selects the k highest scoring nodes with a bounded heap instead of sorting
+    every node. If categories are given, only nodes of those categories
+    (read from graph) are considered.
+    """
+    keep = _category_filter(graph, categories)
+    items = scores.items()
+    if keep is not None:
+        items = ((node, score) for node, score in items if keep(node))
+    return heapq.nlargest(k, items, key=lambda x: x[1])
+
+def _to_adjacency(graph):
+    """
+    Returns the node list and the CSR adjacency matrix of the graph, indexed in node list order.
+    """
+    if isinstance(graph, CompactGraph):
+        return graph.nodes(), graph.adjacency()
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    rows, cols = [], []
+    for u, v in graph.edges():
+        rows.append(index[u])
+        cols.append(index[v])
+    n = len(nodes)
+    data = np.ones(len(rows), dtype=np.float64)
+    adjacency = sp.coo_matrix((data, (rows, cols)), shape=(n, n)).tocsr()
+    if not graph.is_directed():
+        adjacency = adjacency + adjacency.T
+        adjacency.setdiag(adjacency.diagonal() / 2)
+    adjacency.sum_duplicates()
+    return nodes, adjacency
+
+class DegreeIndex:
+    """
+    Keeps node degrees up to date as edges are added or removed, so top-k degree
+    queries do not have to recompute degree centrality over the whole graph.
+    """
+    def __init__(self):
+        self.degrees = defaultdict(int)
+
+    @classmethod
+    def from_graph(cls, graph):
+        index = cls()
+        for node, degree in graph.degree():
+            index.degrees[node] = degree
+        return index
+
+    def add_node(self, node):
+        if node not in self.degrees:
+            self.degrees[node] = 0
+
+    def remove_node(self, node, neighbors=()):
+        """
+        Removes a node; neighbors are the nodes it was connected to.
+        """
+        for neighbor in neighbors:
+            self.degrees[neighbor] -= 1
+        self.degrees.pop(node, None)
+
+    def add_edge(self, u, v):
+        """
+        Records a new edge. Callers must only report edges that were not already in the graph.
+        """
+        self.degrees[u] += 1
+        self.degrees[v] += 1
+
+    def remove_edge(self, u, v):
+        self.degrees[u] -= 1
+        self.degrees[v] -= 1
+
+    def centrality(self):
+        """
+        Returns degree centrality (degree / (n - 1)) for every node, like nx.degree_centrality.
+        """
+        n = len(self.degrees)
+        scale = 1.0 / (n - 1) if n > 1 else 1.0
+        return {node: degree * scale for node, degree in self.degrees.items()}
+
+    def top_k(self, k=10, graph=None, categories=None):
+        n = len(self.degrees)
+        scale = 1.0 / (n - 1) if n > 1 else 1.0
+        top = top_k(self.degrees, k=k, graph=graph, categories=categories)
+        return [(node, degree * scale) for node, degree in top]
+
+class CompactDegreeIndex:
+    """
+    DegreeIndex for a CompactGraph. Degrees are kept in a NumPy array indexed by
+    node ID, and top-k selection filters categories by their codes and uses
+    argpartition instead of a per-node heap.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        self.degrees = graph.degree_array().astype(np.int64)
+
+    @classmethod
+    def from_graph(cls, graph):
+        return cls(graph)
+
+    def _grow(self):
+        missing = self.graph.number_of_nodes() - len(self.degrees)
+        if missing > 0:
+            self.degrees = np.concatenate([self.degrees, np.zeros(missing, dtype=np.int64)])
+
+    def add_node(self, node):
+        """
+        Records a node already added to the graph.
+        """
+        self._grow()
+
+    def add_edge(self, u, v):
+        """
+        Records a new edge. Callers must only report edges that were not already in the graph.
+        """
+        self._grow()
+        self.degrees[self.graph.node_id(u)] += 1
+        self.degrees[self.graph.node_id(v)] += 1
+
+    def remove_edge(self, u, v):
+        self.degrees[self.graph.node_id(u)] -= 1
+        self.degrees[self.graph.node_id(v)] -= 1
+
+    def _scale(self):
+        n = len(self.degrees)
+        return 1.0 / (n - 1) if n > 1 else 1.0
+
+    def centrality(self):
+        return dict(zip(self.graph.nodes(), (self.degrees * self._scale()).tolist()))
+
+    def top_k(self, k=10, graph=None, categories=None):
+        self._grow()
+        if categories is None:
+            candidates = np.arange(len(self.degrees))
+        else:
+            if isinstance(categories, str):
+                categories = [categories]
+            codes = self.graph.category_codes(categories)
+            candidates = np.flatnonzero(np.isin(self.graph.node_category_array(), codes))
+        k = min(k, len(candidates))
+        if k <= 0:
+            return []
+        values = self.degrees[candidates]
+        selected = np.argpartition(-values, k - 1)[:k]
+        selected = selected[np.argsort(-values[selected], kind='stable')]
+        scale = self._scale()
+        return [(self.graph.node_name(i), int(d) * scale)
+                for i, d in zip(candidates[selected].tolist(), values[selected].tolist())]
+
+def degree_index(graph):
+    """
+    Returns the degree index suited to the graph: array-backed for a CompactGraph,
+    dict-backed for a networkx graph.
+    """
+    if isinstance(graph, CompactGraph):
+        return CompactDegreeIndex(graph)
+    return DegreeIndex.from_graph(graph)
+
+def pagerank(graph, alpha=0.85, tol=1.0e-6, max_iter=100):
+    """
+    Computes PageRank with power iteration over a sparse adjacency matrix.
+    Dangling nodes redistribute their rank uniformly, matching nx.pagerank.
+    """
+    nodes, adjacency = _to_adjacency(graph)
+    n = len(nodes)
+    if n == 0:
+        return {}
+
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inv_degree = np.zeros(n)
+    inv_degree[~dangling] = 1.0 / out_degree[~dangling]
+    # Row-normalize so each row holds the transition probabilities of a node
+    transition = sp.diags(inv_degree) @ adjacency
+    transition_t = transition.T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
+    for iteration in range(max_iter):
+        previous = rank
+        rank = alpha * (transition_t @ previous + previous[dangling].sum() / n) + (1 - alpha) / n
+        error = np.abs(rank - previous).sum()
+        if error < n * tol:
+            logger.info(f"PageRank converged after {iteration + 1} iterations.")
+            break
+    else:
+        logger.warning(f"PageRank did not converge within {max_iter} iterations.")
+
+    return dict(zip(nodes, rank.tolist()))
+
+def _batch_dependencies(adjacency, adjacency_t, sources):
+    """
+    Brandes' shortest path counting and dependency accumulation for a batch of
+    sources at once. Each source is a column of an n x batch matrix, and every
+    BFS level is expanded with one sparse product of the adjacency matrix and
+    the sparse frontier, so the work per level is proportional to the edges it touches.
+    Returns the dependencies summed over the batch.
+    """
+    n, batch = adjacency.shape[0], len(sources)
+    columns = np.arange(batch)
+    sigma = np.zeros((n, batch))
+    dist = np.full((n, batch), -1, dtype=np.int32)
+    sigma[sources, columns] = 1.0
+    dist[sources, columns] = 0
+
+    levels = [(np.asarray(sources), columns)]
+    frontier = sp.csr_matrix((np.ones(batch), (sources, columns)), shape=(n, batch))
+    while True:
+        reached = (adjacency_t @ frontier).tocoo()
+        new = dist[reached.row, reached.col] < 0
+        rows, cols, counts = reached.row[new], reached.col[new], reached.data[new]
+        if not len(rows):
+            break
+        dist[rows, cols] = len(levels)
+        sigma[rows, cols] = counts
+        levels.append((rows, cols))
+        frontier = sp.csr_matrix((counts, (rows, cols)), shape=(n, batch))
+
+    delta = np.zeros((n, batch))
+    for depth in range(len(levels) - 1, 0, -1):
+        rows, cols = levels[depth]
+        coefficient = sp.csr_matrix(((1.0 + delta[rows, cols]) / sigma[rows, cols], (rows, cols)), shape=(n, batch))
+        contribution = (adjacency @ coefficient).tocoo()
+        parents = dist[contribution.row, contribution.col] == depth - 1
+        rows, cols = contribution.row[parents], contribution.col[parents]
+        delta[rows, cols] += sigma[rows, cols] * contribution.data[parents]
+    delta[sources, columns] = 0.0
+    return delta.sum(axis=1)
+
+def approximate_betweenness(graph, epsilon=0.05, delta=0.1, time_budget=30.0, normalized=True, seed=None,
+                            batch_size=None, memory_budget=256 * 2 ** 20):
+    """
+    Estimates betweenness centrality by running Brandes' accumulation from a
+    random sample of source nodes and extrapolating to all sources. Sources are
+    processed batch_size at a time with sparse matrix products; by default the
+    batch size is the largest (up to MAX_BATCH_SIZE) whose working set fits in
+    memory_budget bytes.
+
+    The number of samples follows the Hoeffding bound ln(2n / delta) / (2 * epsilon^2),
+    capped at the number of nodes (which yields exact betweenness). time_budget
+    (seconds, None disables it) is checked before each batch: no new batch is
+    started if the previous batch's duration would take the run past the budget.
+    The estimate is then scaled by the number of sources actually processed and
+    the epsilon achieved with them is logged.
+    """
+    nodes, adjacency = _to_adjacency(graph)
+    n = len(nodes)
+    if n == 0:
+        return {}
+
+    samples = min(n, math.ceil(math.log(2 * n / delta) / (2 * epsilon ** 2)))
+    rng = random.Random(seed)
+    sources = range(n) if samples == n else rng.sample(range(n), samples)
+
+    if batch_size is None:
+        batch_size = int(min(MAX_BATCH_SIZE, max(1, memory_budget // (n * BATCH_BYTES_PER_CELL))))
+    sources = np.asarray(sources, dtype=np.int64)
+    adjacency = adjacency.astype(np.float64)
+    adjacency_t = adjacency.T.tocsr()
+    totals = np.zeros(n)
+    processed = 0
+    batch_time = 0.0
+    start_time = time.time()
+    for start in range(0, samples, batch_size):
+        batch_start = time.time()
+        if time_budget is not None and processed and batch_start - start_time + batch_time > time_budget:
+            achieved = math.sqrt(math.log(2 * n / delta) / (2 * processed))
+            logger.warning(f"Betweenness time budget exhausted after {processed} of {samples} samples; "
+                           f"achieved epsilon is {achieved:.4f} instead of {epsilon}.")
+            break
+        batch = sources[start:start + batch_size]
+        totals += _batch_dependencies(adjacency, adjacency_t, batch)
+        processed += len(batch)
+        batch_time = time.time() - batch_start
+
+    totals *= n / processed
+    if normalized:
+        totals *= 1.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    elif not graph.is_directed():
+        totals *= 0.5
+
+    logger.info(f"Approximate betweenness computed from {processed} sampled sources.")
+    return dict(zip(nodes, totals.tolist()))
@@ -0,0 +1,362 @@
+import math
+from array import array
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+
+# Edges added or removed since the last compaction are buffered and merged into
+# the sorted edge arrays once this many have accumulated.
+PENDING_EDGE_LIMIT = 100_000
+
+class InternTable:
+    """
+    Maps strings to dense integer IDs and back.
+    """
+    def __init__(self, values=()):
+        self.values = []
+        self.ids = {}
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value):
+        id_ = self.ids.get(value)
+        if id_ is None:
+            id_ = len(self.values)
+            self.ids[value] = id_
+            self.values.append(value)
+        return id_
+
+    def get(self, value):
+        return self.ids.get(value)
+
+    def __getitem__(self, id_):
+        return self.values[id_]
+
+    def __contains__(self, value):
+        return value in self.ids
+
+    def __len__(self):
+        return len(self.values)
+
+def _node_key(node):
+    """
+    Node names are stored as strings, so the in-memory graph and a saved one agree
+    on node identity. Missing names (None/NaN) are rejected.
+    """
+    if isinstance(node, str):
+        return node
+    if node is None or (isinstance(node, float) and math.isnan(node)):
+        raise ValueError(f"Invalid node name: {node!r}")
+    return str(node)
+
+def _pack_strings(values):
+    encoded = [str(value).encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+def _unpack_strings(blob, offsets):
+    data = blob.tobytes()
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+class CompactGraph:
+    """
+    Memory-compact undirected knowledge graph.
+
+    Node names are interned to integer IDs, node categories and edge relations
+    are stored as uint8 codes into small vocabularies, and edges are kept as a
+    sorted array of packed (low ID, high ID) int64 keys. A symmetric CSR
+    adjacency matrix is built on demand for traversals and centrality, and
+    to_networkx() provides a networkx view for algorithms that need one.
+    """
+    def __init__(self):
+        self._nodes = InternTable()
+        # Code 0 is reserved for a missing category/relation
+        self._categories = InternTable([None])
+        self._relations = InternTable([None])
+        self._node_categories = array('B')
+        self._edge_keys = np.empty(0, dtype=np.int64)
+        self._edge_relations = np.empty(0, dtype=np.uint8)
+        self._pending = {}
+        # Keys of compacted edges that were removed since the last compaction
+        self._removed = set()
+        self._adjacency = None
+
+    @staticmethod
+    def _code(table, value):
+        code = table.intern(None if value is None else str(value))
+        if code > 255:
+            raise ValueError(f"Too many distinct values for a uint8 code: {value}")
+        return code
+
+    @staticmethod
+    def _key(u, v):
+        if u > v:
+            u, v = v, u
+        return (u << 32) | v
+
+    def _lookup(self, node):
+        """
+        Returns the ID of node, or None if it is not in the graph.
+        """
+        try:
+            return self._nodes.get(_node_key(node))
+        except ValueError:
+            return None
+
+    def node_id(self, node):
+        id_ = self._lookup(node)
+        if id_ is None:
+            raise KeyError(f"Node {node} is not in the graph.")
+        return id_
+
+    def node_name(self, id_):
+        return self._nodes[id_]
+
+    def _search(self, key):
+        """
+        Returns the position of key in the compacted edge arrays, or -1 if it is
+        missing or has been removed.
+        """
+        if key in self._removed:
+            return -1
+        return self._position(key)
+
+    def _position(self, key):
+        position = np.searchsorted(self._edge_keys, key)
+        if position < len(self._edge_keys) and self._edge_keys[position] == key:
+            return int(position)
+        return -1
+
+    def _flush(self):
+        """
+        Applies buffered removals and merges buffered edges into the sorted edge arrays.
+        """
+        if self._removed:
+            removed = np.fromiter(self._removed, dtype=np.int64, count=len(self._removed))
+            keep = ~np.isin(self._edge_keys, removed)
+            self._edge_keys = self._edge_keys[keep]
+            self._edge_relations = self._edge_relations[keep]
+            self._removed.clear()
+        if not self._pending:
+            return
+        keys = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+        relations = np.fromiter(self._pending.values(), dtype=np.uint8, count=len(self._pending))
+        keys = np.concatenate([self._edge_keys, keys])
+        relations = np.concatenate([self._edge_relations, relations])
+        order = np.argsort(keys, kind='stable')
+        self._edge_keys = keys[order]
+        self._edge_relations = relations[order]
+        self._pending.clear()
+
+    def _buffered(self):
+        return len(self._pending) + len(self._removed)
+
+    def add_node(self, node, category=None):
+        """
+        Adds a node, or updates its category if given; like networkx, re-adding a
+        node without a category keeps the existing one.
+        """
+        id_ = self._nodes.intern(_node_key(node))
+        if id_ == len(self._node_categories):
+            self._node_categories.append(self._code(self._categories, category))
+            self._adjacency = None
+        elif category is not None:
+            self._node_categories[id_] = self._code(self._categories, category)
+        return id_
+
+    def _ensure_node(self, node):
+        id_ = self._lookup(node)
+        return self.add_node(node) if id_ is None else id_
+
+    def add_edge(self, u, v, relation=None):
+        """
+        Adds an edge, creating missing nodes. Re-adding an edge overwrites its relation.
+        """
+        key = self._key(self._ensure_node(u), self._ensure_node(v))
+        code = self._code(self._relations, relation)
+        position = self._position(key)
+        if position >= 0:
+            if key in self._removed:
+                # Re-adding a removed compacted edge revives it in place
+                self._removed.discard(key)
+                self._adjacency = None
+            self._edge_relations[position] = code
+            return
+        if key not in self._pending:
+            self._adjacency = None
+        self._pending[key] = code
+        if self._buffered() >= PENDING_EDGE_LIMIT:
+            self._flush()
+
+    def remove_edge(self, u, v):
+        """
+        Removes an edge. Compacted edges are marked as removed and dropped from
+        the edge arrays at the next compaction.
+        """
+        key = self._key(self.node_id(u), self.node_id(v))
+        if self._pending.pop(key, None) is None:
+            if self._search(key) < 0:
+                raise KeyError(f"Edge {u}-{v} is not in the graph.")
+            self._removed.add(key)
+            if self._buffered() >= PENDING_EDGE_LIMIT:
+                self._flush()
+        self._adjacency = None
+
+    def has_node(self, node):
+        return self._lookup(node) is not None
+
+    def has_edge(self, u, v):
+        u, v = self._lookup(u), self._lookup(v)
+        if u is None or v is None:
+            return False
+        key = self._key(u, v)
+        return key in self._pending or self._search(key) >= 0
+
+    def __contains__(self, node):
+        return self.has_node(node)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def is_directed(self):
+        return False
+
+    def number_of_nodes(self):
+        return len(self._nodes)
+
+    def number_of_edges(self):
+        return len(self._edge_keys) - len(self._removed) + len(self._pending)
+
+    def nodes(self):
+        return list(self._nodes.values)
+
+    def category(self, node):
+        return self._categories[self._node_categories[self.node_id(node)]]
+
+    def category_codes(self, categories):
+        """
+        Returns the uint8 codes of the given category names; unknown names are skipped.
+        """
+        return [self._categories.get(c) for c in categories if c in self._categories]
+
+    def node_category_array(self):
+        return np.frombuffer(self._node_categories, dtype=np.uint8).copy()
+
+    def relation(self, u, v):
+        key = self._key(self.node_id(u), self.node_id(v))
+        if key in self._pending:
+            return self._relations[self._pending[key]]
+        position = self._search(key)
+        if position < 0:
+            raise KeyError(f"Edge {u}-{v} is not in the graph.")
+        return self._relations[self._edge_relations[position]]
+
+    def _edge_endpoints(self):
+        self._flush()
+        return (self._edge_keys >> 32).astype(np.int32), (self._edge_keys & 0xFFFFFFFF).astype(np.int32)
+
+    def edges(self, data=False):
+        low, high = self._edge_endpoints()
+        names = self._nodes.values
+        if data:
+            relations = self._relations.values
+            for u, v, code in zip(low.tolist(), high.tolist(), self._edge_relations.tolist()):
+                yield names[u], names[v], {'relation': relations[code]}
+        else:
+            for u, v in zip(low.tolist(), high.tolist()):
+                yield names[u], names[v]
+
+    def adjacency(self):
+        """
+        Returns the symmetric CSR adjacency matrix, indexed by node ID (the order of nodes()).
+        Self-loops appear once on the diagonal.
+        """
+        if self._adjacency is None:
+            low, high = self._edge_endpoints()
+            mirrored = low != high
+            rows = np.concatenate([low, high[mirrored]])
+            cols = np.concatenate([high, low[mirrored]])
+            n = len(self._nodes)
+            data = np.ones(len(rows), dtype=np.int8)
+            self._adjacency = sp.csr_matrix((data, (rows, cols)), shape=(n, n))
+        return self._adjacency
+
+    def degree_array(self):
+        """
+        Returns node degrees indexed by node ID; self-loops count twice, as in networkx.
+        """
+        low, high = self._edge_endpoints()
+        n = len(self._nodes)
+        return np.bincount(low, minlength=n) + np.bincount(high, minlength=n)
+
+    def degree(self):
+        return zip(self._nodes.values, self.degree_array().tolist())
+
+    def degree_of(self, node):
+        id_ = self.node_id(node)
+        adjacency = self.adjacency()
+        start, end = adjacency.indptr[id_], adjacency.indptr[id_ + 1]
+        return int(end - start) + int(np.count_nonzero(adjacency.indices[start:end] == id_))
+
+    def neighbors(self, node):
+        id_ = self.node_id(node)
+        adjacency = self.adjacency()
+        names = self._nodes.values
+        return [names[i] for i in adjacency.indices[adjacency.indptr[id_]:adjacency.indptr[id_ + 1]].tolist()]
+
+    def to_networkx(self):
+        """
+        Returns an equivalent networkx.Graph with 'category' node and 'relation' edge attributes.
+        """
+        graph = nx.Graph()
+        categories = self._categories.values
+        graph.add_nodes_from((node, {'category': categories[code]})
+                             for node, code in zip(self._nodes.values, self._node_categories))
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+    @classmethod
+    def from_networkx(cls, graph):
+        compact = cls()
+        for node, attributes in graph.nodes(data=True):
+            compact.add_node(node, category=attributes.get('category'))
+        for u, v, attributes in graph.edges(data=True):
+            compact.add_edge(u, v, relation=attributes.get('relation'))
+        return compact
+
+    def save(self, path):
+        """
+        Saves the graph as a compressed .npz archive of its arrays.
+        """
+        self._flush()
+        node_blob, node_offsets = _pack_strings(self._nodes.values)
+        category_blob, category_offsets = _pack_strings(self._categories.values[1:])
+        relation_blob, relation_offsets = _pack_strings(self._relations.values[1:])
+        np.savez_compressed(
+            path,
+            node_blob=node_blob, node_offsets=node_offsets,
+            category_blob=category_blob, category_offsets=category_offsets,
+            relation_blob=relation_blob, relation_offsets=relation_offsets,
+            node_categories=self.node_category_array(),
+            edge_keys=self._edge_keys, edge_relations=self._edge_relations)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as archive:
+            graph = cls()
+            graph._nodes = InternTable(_unpack_strings(archive['node_blob'], archive['node_offsets']))
+            graph._categories = InternTable([None] + _unpack_strings(archive['category_blob'], archive['category_offsets']))
+            graph._relations = InternTable([None] + _unpack_strings(archive['relation_blob'], archive['relation_offsets']))
+            graph._node_categories = array('B', archive['node_categories'].tobytes())
+            graph._edge_keys = archive['edge_keys']
+            graph._edge_relations = archive['edge_relations']
+        return graph
+
+def load_graph(graph_path):
+    """
+    Loads a CompactGraph from a .npz archive, or converts a GEXF file written by networkx.
+    """
+    if str(graph_path).endswith('.npz'):
+        return CompactGraph.load(graph_path)
+    return CompactGraph.from_networkx(nx.read_gexf(graph_path))
@@ -9,6 +9,7 @@ from pytrends.request import TrendReq
 from pathlib import Path
 from dotenv import load_dotenv
 import re
+from scripts.trends import chunk_keywords, combine_anchored_frames
 
 # Load environment variables from .env file
 load_dotenv()
@@ -31,12 +32,22 @@ def log_request_response(response):
     logging.info(f"Response Headers: {response.headers}")
     logging.info(f"Response Body: {response.text}")
 
-def fetch_google_trends_data(keywords):
+def fetch_google_trends_data(keywords, anchor=None, timeframe='now 7-d'):
+    """
+    Fetches Google Trends interest for any number of keywords. Keywords are sent in
+    payloads of at most five that all include a shared anchor keyword (the first
+    keyword by default), and each payload is rescaled onto the first one through
+    the anchor so scores are comparable across payloads.
+    """
     try:
         pytrends = TrendReq(hl='en-US', tz=360)
-        pytrends.build_payload(keywords, cat=0, timeframe='now 7-d', geo='', gprop='')
-        time.sleep(10)  # Introduce a delay to avoid rate limiting
-        trends_data = pytrends.interest_over_time()
+        anchor = anchor or keywords[0]
+        frames = []
+        for chunk in chunk_keywords(keywords, anchor):
+            pytrends.build_payload(chunk, cat=0, timeframe=timeframe, geo='', gprop='')
+            time.sleep(10)  # Introduce a delay to avoid rate limiting
+            frames.append(pytrends.interest_over_time())
+        trends_data = combine_anchored_frames(frames, anchor)
 
         if not trends_data.empty:
             filename = f"{RAW_DATA_PATH}/google_trends_{datetime.now().strftime('%Y%m%d%H%M%S')}.csv"
@@ -5,6 +5,7 @@ import time
 import spacy
 from textblob import TextBlob
 from pathlib import Path
+from scripts.trends import TrendStore
 
 # Initialize logging
 logging.basicConfig(filename='./logs/data_processing.log', level=logging.INFO)
@@ -41,27 +42,26 @@ def process_ner(text):
     entities = [ent.text for ent in doc.ents if ent.label_ in ['ORG', 'PRODUCT', 'TECH']]
     return entities
 
-def process_google_trends():
+def process_google_trends(store=None):
+    """
+    Merges raw Google Trends windows into the append-only trend store and saves the
+    rolling statistics of the newly appended points.
+    """
     start_time = time.time()
     try:
-        files = [f for f in os.listdir(RAW_DATA_PATH) if f.startswith('google_trends')]
+        store = store or TrendStore()
+        files = sorted(f for f in os.listdir(RAW_DATA_PATH) if f.startswith('google_trends'))
         for file in files:
-            df = pd.read_csv(os.path.join(RAW_DATA_PATH, file))
-            df.columns = [normalize_text(col) for col in df.columns]
-            # Check if the column exists
-            if 'some_column' not in df.columns:
-                logging.warning("Column 'some_column' is missing in the data.")
+            if store.has_merged(file):
                 continue
-
-            # Check if the sum of the column is zero
-            if df['some_column'].sum() == 0:
-                logging.warning("Sum of column 'some_column' is zero, skipping division.")
+            df = pd.read_csv(os.path.join(RAW_DATA_PATH, file), index_col='date', parse_dates=['date'])
+            new_points = store.merge_window(df, source=file)
+            if new_points.empty:
+                logging.info(f"No new Google Trends points in {file}.")
                 continue
 
-            # Perform the division
-            df['trend_change'] = df.iloc[:, 1:].pct_change(axis='columns').fillna(0)
             filename = os.path.join(PROCESSED_DATA_PATH, f"processed_{file}")
-            df.to_csv(filename, index=False)
+            new_points.to_csv(filename, index=False)
             logging.info(f"Processed Google Trends data saved to {filename}")
     except Exception as e:
         logging.error(f"Error processing Google Trends data: {e}")
@@ -1,6 +1,9 @@
 import networkx as nx
 import logging
 from pathlib import Path
+from scipy.sparse.csgraph import breadth_first_order
+from scripts.compact_graph import CompactGraph, load_graph
+from scripts.centrality import degree_index, top_k, pagerank, approximate_betweenness
 
 # Initialize logging
 logging.basicConfig(filename='./logs/query_graph.log', level=logging.INFO)
@@ -13,11 +16,12 @@ def get_data_path(data_type):
 class KnowledgeGraphQuery:
     def __init__(self, graph_path: str):
         self.graph = self._load_graph(graph_path)
+        self.degree_index = degree_index(self.graph)
 
-    def _load_graph(self, graph_path: str) -> nx.Graph:
+    def _load_graph(self, graph_path: str) -> CompactGraph:
         try:
-            graph = nx.read_gexf(graph_path)
-            logging.info(f"Graph loaded successfully with {len(graph.nodes())} nodes and {len(graph.edges())} edges.")
+            graph = load_graph(graph_path)
+            logging.info(f"Graph loaded successfully with {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges.")
             return graph
         except Exception as e:
             logging.error(f"Failed to load graph: {e}")
@@ -41,25 +45,65 @@ class KnowledgeGraphQuery:
             logging.error(f"Error during BFS traversal: {e}")
             return []
 
-    def centrality_query(self):
+    def add_relation(self, node_a, node_b, relation, categories=None):
         """
-        Finds the most central nodes in the graph based on degree centrality.
+        Adds an edge to the loaded graph and keeps the degree index in sync.
+        categories optionally maps new nodes to their category.
+        """
+        categories = categories or {}
+        for node in (node_a, node_b):
+            if node not in self.graph:
+                self.graph.add_node(node, category=categories.get(node))
+                self.degree_index.add_node(node)
+        is_new = not self.graph.has_edge(node_a, node_b)
+        self.graph.add_edge(node_a, node_b, relation=relation)
+        if is_new:
+            self.degree_index.add_edge(node_a, node_b)
+
+    def remove_relation(self, node_a, node_b):
+        """
+        Removes an edge from the loaded graph and keeps the degree index in sync.
+        """
+        if self.graph.has_edge(node_a, node_b):
+            self.graph.remove_edge(node_a, node_b)
+            self.degree_index.remove_edge(node_a, node_b)
+
+    def centrality_query(self, k=10, categories=None, method='degree', **kwargs):
+        """
+        Finds the k most central nodes in the graph, optionally restricted to the given categories.
+        method is one of 'degree' (incrementally maintained), 'pagerank' or
+        'betweenness' (sampling-based approximation); extra keyword arguments are
+        passed to the underlying algorithm.
         """
         try:
-            centrality = nx.degree_centrality(self.graph)
-            sorted_nodes = sorted(centrality.items(), key=lambda x: x[1], reverse=True)
-            logging.info("Centrality query completed.")
-            return sorted_nodes[:10]  # Top 10 central nodes
+            if method == 'degree':
+                top_nodes = self.degree_index.top_k(k=k, graph=self.graph, categories=categories)
+            elif method == 'pagerank':
+                top_nodes = top_k(pagerank(self.graph, **kwargs), k=k, graph=self.graph, categories=categories)
+            elif method == 'betweenness':
+                scores = approximate_betweenness(self.graph, **kwargs)
+                top_nodes = top_k(scores, k=k, graph=self.graph, categories=categories)
+            else:
+                raise ValueError(f"Unknown centrality method: {method}")
+            logging.info(f"Centrality query ({method}) completed.")
+            return top_nodes
         except Exception as e:
             logging.error(f"Error during centrality query: {e}")
             return []
 
     def shortest_path_query(self, node_a, node_b):
         """
-        Finds the shortest path between two nodes in the graph.
+        Finds the shortest path between two nodes in the graph with a BFS over the CSR adjacency.
         """
         try:
-            path = nx.shortest_path(self.graph, source=node_a, target=node_b)
+            source, target = self.graph.node_id(node_a), self.graph.node_id(node_b)
+            _, predecessors = breadth_first_order(self.graph.adjacency(), source, directed=False, return_predecessors=True)
+            if source != target and predecessors[target] < 0:
+                raise nx.NetworkXNoPath(f"No path between {node_a} and {node_b}.")
+            path = [target]
+            while path[-1] != source:
+                path.append(int(predecessors[path[-1]]))
+            path = [self.graph.node_name(i) for i in reversed(path)]
             logging.info(f"Shortest path between {node_a} and {node_b} is {path}")
             return path
         except Exception as e:
@@ -68,6 +112,6 @@ class KnowledgeGraphQuery:
 
 # Example usage
 if __name__ == "__main__":
-    query = KnowledgeGraphQuery('./data/processed/knowledge_graph.gexf')
+    query = KnowledgeGraphQuery('./data/processed/knowledge_graph.npz')
     top_nodes = query.centrality_query()
     print(f"Top central nodes: {top_nodes}")
@@ -0,0 +1,238 @@
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Function to get data path
+def get_data_path(data_type):
+    base_path = Path('./data')
+    return base_path / data_type
+
+TREND_STORE_PATH = get_data_path('processed') / 'google_trends_series.csv'
+
+# Google Trends accepts at most 5 keywords per payload
+MAX_PAYLOAD_KEYWORDS = 5
+
+# Columns of the appended points returned by TrendStore.merge_window
+POINT_COLUMNS = ['date', 'keyword', 'value', 'pct_change', 'moving_average', 'zscore', 'spike']
+
+def chunk_keywords(keywords, anchor):
+    """
+    Splits keywords into payloads of at most MAX_PAYLOAD_KEYWORDS that all include the anchor keyword.
+    """
+    others = [k for k in dict.fromkeys(keywords) if k != anchor]
+    size = MAX_PAYLOAD_KEYWORDS - 1
+    if not others:
+        return [[anchor]]
+    return [[anchor] + others[i:i + size] for i in range(0, len(others), size)]
+
+def combine_anchored_frames(frames, anchor):
+    """
+    Combines interest_over_time frames fetched with a shared anchor keyword.
+    Each frame is rescaled so its anchor series matches the anchor of the first
+    frame, which makes scores comparable across payloads.
+    """
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    reference = frames[0][anchor]
+    combined = frames[0].drop(columns=['isPartial'], errors='ignore')
+    partials = [frame['isPartial'].astype(bool) for frame in frames if 'isPartial' in frame]
+    for frame in frames[1:]:
+        overlap = reference.index.intersection(frame.index)
+        anchor_sum = frame.loc[overlap, anchor].sum()
+        reference_sum = reference.loc[overlap].sum()
+        if anchor_sum > 0 and reference_sum > 0:
+            factor = reference_sum / anchor_sum
+        else:
+            # Google Trends reports interest below 1 as 0, so a zero anchor cannot be used as a reference
+            logger.warning(f"Anchor keyword '{anchor}' has no interest in a payload; chunk left unscaled.")
+            factor = 1.0
+        scaled = frame.drop(columns=[anchor, 'isPartial'], errors='ignore') * factor
+        combined = combined.join(scaled, how='outer')
+    if partials:
+        combined['isPartial'] = pd.concat(partials, axis=1).reindex(combined.index).fillna(False).astype(bool).any(axis=1)
+    return combined
+
+def rolling_stats(history, new_values, window=24, z_threshold=3.0):
+    """
+    Computes rolling statistics for new_values only, using the last `window`
+    points of history as context.
+
+    Returns a dict of arrays aligned with new_values: 'pct_change' against the
+    previous point, 'moving_average' over the trailing window (including the
+    point), 'zscore' of the point against the mean and standard deviation of the
+    preceding window, and 'spike' where the z-score exceeds z_threshold.
+    """
+    history = np.asarray(history, dtype=np.float64)[-window:]
+    new_values = np.asarray(new_values, dtype=np.float64)
+    values = np.concatenate([history, new_values])
+    positions = np.arange(len(history), len(values))
+
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    squares = np.concatenate([[0.0], np.cumsum(values ** 2)])
+
+    # Trailing window including the point itself
+    start = np.maximum(positions + 1 - window, 0)
+    moving_average = (sums[positions + 1] - sums[start]) / (positions + 1 - start)
+
+    # Preceding window, excluding the point itself
+    start = np.maximum(positions - window, 0)
+    count = positions - start
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = (sums[positions] - sums[start]) / count
+        variance = (squares[positions] - squares[start]) / count - mean ** 2
+        std = np.sqrt(np.maximum(variance, 0.0))
+        zscore = np.where((count >= 2) & (std > 0), (new_values - mean) / std, 0.0)
+
+        previous = values[positions - 1]
+        pct_change = np.where((positions > 0) & (previous != 0), (new_values - previous) / previous, 0.0)
+
+    return {
+        'pct_change': pct_change,
+        'moving_average': moving_average,
+        'zscore': zscore,
+        'spike': zscore > z_threshold,
+    }
+
+class TrendStore:
+    """
+    Append-only store of Google Trends time series, persisted as a long-format
+    CSV (date, keyword, value).
+
+    Google Trends normalizes every fetched window to 0-100 on its own, so each
+    new window is rescaled by a single factor, computed from the points where it
+    overlaps the stored series of all its keywords, before its newer points are
+    appended. Using one factor for the whole window keeps keywords comparable,
+    including ones seen for the first time. Stored points are never rewritten.
+
+    The names of merged raw files are recorded in an append-only manifest next
+    to the store, so each raw window is only merged once.
+    """
+    def __init__(self, path=TREND_STORE_PATH, window=24, z_threshold=3.0):
+        self.path = Path(path)
+        self.sources_path = self.path.with_name(f"{self.path.stem}_sources.txt")
+        self.window = window
+        self.z_threshold = z_threshold
+        self.times = {}
+        self.values = {}
+        self.sources = set()
+        self._load()
+
+    def _load(self):
+        if self.sources_path.exists():
+            self.sources = set(self.sources_path.read_text().split())
+        if not self.path.exists():
+            return
+        df = pd.read_csv(self.path, parse_dates=['date'])
+        for keyword, group in df.groupby('keyword', sort=False):
+            group = group.sort_values('date')
+            self.times[keyword] = group['date'].to_numpy(dtype='datetime64[ns]')
+            self.values[keyword] = group['value'].to_numpy(dtype=np.float64)
+        logger.info(f"Trend store loaded with {len(self.times)} keywords from {self.path}.")
+
+    def keywords(self):
+        return list(self.times)
+
+    def series(self, keyword):
+        return pd.Series(self.values[keyword], index=pd.DatetimeIndex(self.times[keyword]), name=keyword)
+
+    def has_merged(self, source):
+        return source in self.sources
+
+    def _record_source(self, source):
+        self.sources.add(source)
+        with open(self.sources_path, 'a') as f:
+            f.write(f"{source}\n")
+
+    def _window_factor(self, frame, times):
+        """
+        Returns the factor that rescales a window onto the store, pooled over the
+        overlap of every keyword already stored. Only the stored tail from the
+        window's first timestamp on is searched for the overlap.
+        """
+        stored_sum = new_sum = 0.0
+        for keyword in frame.columns:
+            if keyword not in self.times or not len(times):
+                continue
+            start = np.searchsorted(self.times[keyword], times[0])
+            column = frame[keyword].to_numpy(dtype=np.float64)
+            _, stored_idx, new_idx = np.intersect1d(self.times[keyword][start:], times, assume_unique=True,
+                                                    return_indices=True)
+            new_values = column[new_idx]
+            valid = ~np.isnan(new_values)
+            stored_sum += self.values[keyword][start:][stored_idx][valid].sum()
+            new_sum += new_values[valid].sum()
+        if new_sum > 0 and stored_sum > 0:
+            return stored_sum / new_sum
+        if self.times:
+            # Google Trends reports interest below 1 as 0; scaling by a zero overlap would zero the window
+            logger.warning("New window has no usable overlap with the stored series; appended unscaled.")
+        return 1.0
+
+    def _append_series(self, keyword, times, values):
+        """
+        Appends the points of an already rescaled window that are newer than the stored series.
+        Returns the appended times, values and their rolling statistics.
+        """
+        stored_times = self.times.get(keyword, np.empty(0, dtype='datetime64[ns]'))
+        stored_values = self.values.get(keyword, np.empty(0, dtype=np.float64))
+        if len(stored_times):
+            is_new = times > stored_times[-1]
+            times, values = times[is_new], values[is_new]
+
+        stats = rolling_stats(stored_values, values, window=self.window, z_threshold=self.z_threshold)
+        self.times[keyword] = np.concatenate([stored_times, times])
+        self.values[keyword] = np.concatenate([stored_values, values])
+        return times, values, stats
+
+    def _is_stale(self, frame, times):
+        """
+        Returns True if the window has no points newer than the stored series of any of its keywords.
+        """
+        if not len(times):
+            return True
+        return all(keyword in self.times and len(self.times[keyword]) and times[-1] <= self.times[keyword][-1]
+                   for keyword in frame.columns)
+
+    def merge_window(self, frame, source=None):
+        """
+        Merges an interest_over_time frame (DatetimeIndex, one column per keyword)
+        into the store. Partial points are dropped, since appended points are final.
+        If source (e.g. the raw file name) is given, it is recorded as merged.
+        Returns a long-format DataFrame of the appended points with their rolling statistics.
+        """
+        if 'isPartial' in frame:
+            frame = frame[~frame['isPartial'].astype(bool)].drop(columns=['isPartial'])
+        frame = frame.sort_index()
+        times = frame.index.to_numpy(dtype='datetime64[ns]')
+        appended = self._merge_frame(frame, times)
+        if source is not None:
+            self._record_source(source)
+        return appended
+
+    def _merge_frame(self, frame, times):
+        """
+        Rescales a cleaned window onto the store and appends its new points.
+        """
+        if self._is_stale(frame, times):
+            return pd.DataFrame(columns=POINT_COLUMNS)
+        factor = self._window_factor(frame, times)
+
+        appended = []
+        for keyword in frame.columns:
+            column = frame[keyword].to_numpy(dtype=np.float64) * factor
+            valid = ~np.isnan(column)
+            new_times, new_values, stats = self._append_series(keyword, times[valid], column[valid])
+            if len(new_times):
+                appended.append(pd.DataFrame({'date': new_times, 'keyword': keyword, 'value': new_values, **stats}))
+
+        if not appended:
+            return pd.DataFrame(columns=POINT_COLUMNS)
+        appended = pd.concat(appended, ignore_index=True)
+        appended[['date', 'keyword', 'value']].to_csv(self.path, mode='a', index=False, header=not self.path.exists())
+        logger.info(f"Appended {len(appended)} trend points to {self.path}.")
+        return appended
@@ -3,6 +3,7 @@ import plotly.graph_objs as go
 from networkx.algorithms.community import greedy_modularity_communities
 import logging
 from pathlib import Path
+from scripts.compact_graph import CompactGraph, load_graph
 
 # Initialize logging
 logging.basicConfig(filename='./logs/visualize_graph.log', level=logging.INFO)
@@ -15,13 +16,15 @@ def get_data_path(data_type):
 class AdvancedKnowledgeGraphVisualizer:
     def __init__(self, graph_path: str):
         self.graph = self._load_graph(graph_path)
+        # Layout and community detection need networkx algorithms
+        self.nx_graph = self.graph.to_networkx()
         self.pos = self._compute_layout()
         self.communities = self._detect_communities()
 
-    def _load_graph(self, graph_path: str) -> nx.Graph:
+    def _load_graph(self, graph_path: str) -> CompactGraph:
         try:
-            graph = nx.read_gexf(graph_path)
-            logging.info(f"Graph loaded successfully with {len(graph.nodes())} nodes and {len(graph.edges())} edges.")
+            graph = load_graph(graph_path)
+            logging.info(f"Graph loaded successfully with {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges.")
             return graph
         except Exception as e:
             logging.error(f"Failed to load graph: {e}")
@@ -29,7 +32,7 @@ class AdvancedKnowledgeGraphVisualizer:
 
     def _compute_layout(self) -> dict:
         try:
-            layout = nx.spring_layout(self.graph, k=0.5, iterations=100)
+            layout = nx.spring_layout(self.nx_graph, k=0.5, iterations=100)
             logging.info("Graph layout computed successfully.")
             return layout
         except Exception as e:
@@ -37,7 +40,7 @@ class AdvancedKnowledgeGraphVisualizer:
             raise
 
     def _detect_communities(self):
-        communities = list(greedy_modularity_communities(self.graph))
+        communities = list(greedy_modularity_communities(self.nx_graph))
         logging.info(f"Detected {len(communities)} communities.")
         return communities
 
@@ -74,13 +77,14 @@ class AdvancedKnowledgeGraphVisualizer:
                 ),
                 line_width=2))
 
-        for node in self.graph.nodes():
+        for node, degree in self.graph.degree():
+            category = self.graph.category(node)
             x, y = self.pos[node]
             node_trace['x'] += tuple([x])
             node_trace['y'] += tuple([y])
-            node_trace['text'] += tuple([f"{node} (Category: {self.graph.nodes[node]['category']})"])
-            node_trace['marker']['color'] += tuple([hash(self.graph.nodes[node]['category']) % 100])
-            node_trace['marker']['size'] += tuple([5 + 3 * self.graph.degree[node]])
+            node_trace['text'] += tuple([f"{node} (Category: {category})"])
+            node_trace['marker']['color'] += tuple([hash(category) % 100])
+            node_trace['marker']['size'] += tuple([5 + 3 * degree])
 
         logging.info("Node trace created.")
         return node_trace
@@ -106,5 +110,5 @@ class AdvancedKnowledgeGraphVisualizer:
 
 # Example usage
 if __name__ == "__main__":
-    visualizer = AdvancedKnowledgeGraphVisualizer('./data/processed/knowledge_graph.gexf')
+    visualizer = AdvancedKnowledgeGraphVisualizer('./data/processed/knowledge_graph.npz')
     visualizer.visualize()
@@ -0,0 +1,23 @@
+import networkx as nx
+import pytest
+
+@pytest.fixture(params=['int', 'str'])
+def node_key(request):
+    """
+    Maps a karate club member number to a node key, either the int itself or a string name.
+    """
+    if request.param == 'int':
+        return lambda i: i
+    return lambda i: f"node {i}"
+
+@pytest.fixture
+def sample_graph(node_key):
+    """
+    Unweighted karate club graph with alternating Keyword/Entity node categories
+    and 'Contains' edge relations.
+    """
+    graph = nx.Graph()
+    for i in range(34):
+        graph.add_node(node_key(i), category='Keyword' if i % 2 else 'Entity')
+    graph.add_edges_from(((node_key(u), node_key(v)) for u, v in nx.karate_club_graph().edges()), relation='Contains')
+    return graph
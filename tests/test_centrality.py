@@ -0,0 +1,52 @@
+import networkx as nx
+import pytest
+from scripts.centrality import DegreeIndex, top_k, pagerank, approximate_betweenness
+
+def test_top_k_filters_by_category(sample_graph):
+    graph = sample_graph
+    scores = nx.degree_centrality(graph)
+    top = top_k(scores, k=3, graph=graph, categories='Keyword')
+    keywords = ((n, s) for n, s in scores.items() if graph.nodes[n]['category'] == 'Keyword')
+    expected = sorted(keywords, key=lambda x: x[1], reverse=True)[:3]
+    assert [s for _, s in top] == [s for _, s in expected]
+    assert all(graph.nodes[n]['category'] == 'Keyword' for n, _ in top)
+
+def test_degree_index_tracks_updates(sample_graph, node_key):
+    graph = sample_graph
+    index = DegreeIndex.from_graph(graph)
+    graph.add_edge(node_key(0), node_key(100))
+    index.add_node(node_key(100))
+    index.add_edge(node_key(0), node_key(100))
+    graph.remove_edge(node_key(0), node_key(1))
+    index.remove_edge(node_key(0), node_key(1))
+    assert index.centrality() == pytest.approx(nx.degree_centrality(graph))
+
+def test_pagerank_matches_networkx(sample_graph):
+    graph = sample_graph
+    graph.add_node('isolated', category='Keyword')
+    expected = nx.pagerank(graph, tol=1.0e-10, weight=None)
+    assert pagerank(graph, tol=1.0e-10) == pytest.approx(expected, abs=1.0e-6)
+
+def test_betweenness_is_exact_when_all_sources_sampled(sample_graph):
+    graph = sample_graph
+    estimate = approximate_betweenness(graph, epsilon=0.01)
+    assert estimate == pytest.approx(nx.betweenness_centrality(graph))
+
+def test_betweenness_batches_match_networkx():
+    graph = nx.gnp_random_graph(60, 0.05, seed=3, directed=True)
+    estimate = approximate_betweenness(graph, epsilon=0.01, batch_size=7)
+    assert estimate == pytest.approx(nx.betweenness_centrality(graph))
+
+def test_betweenness_time_budget_stops_sampling():
+    graph = nx.barabasi_albert_graph(2000, 2, seed=1)
+    estimate = approximate_betweenness(graph, epsilon=0.01, time_budget=0.0, batch_size=16, seed=1)
+    assert len(estimate) == 2000
+    assert max(estimate.values()) > 0
+
+def test_betweenness_sampling_ranks_hubs_first():
+    graph = nx.barabasi_albert_graph(2000, 2, seed=1)
+    estimate = approximate_betweenness(graph, epsilon=0.1, seed=1)
+    exact = nx.betweenness_centrality(graph)
+    top_exact = {n for n, _ in top_k(exact, k=5)}
+    top_estimate = {n for n, _ in top_k(estimate, k=10)}
+    assert top_exact <= top_estimate
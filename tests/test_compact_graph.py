@@ -0,0 +1,125 @@
+import networkx as nx
+import pytest
+import scripts.compact_graph as compact_graph
+from scripts.compact_graph import CompactGraph, load_graph
+from scripts.centrality import DegreeIndex, CompactDegreeIndex, pagerank, approximate_betweenness
+from scripts.query_graph import KnowledgeGraphQuery
+
+def test_networkx_round_trip(sample_graph):
+    compact = CompactGraph.from_networkx(sample_graph)
+    # CompactGraph stores node names as strings
+    graph = nx.relabel_nodes(sample_graph, str)
+    assert compact.number_of_nodes() == graph.number_of_nodes()
+    assert compact.number_of_edges() == graph.number_of_edges()
+    view = compact.to_networkx()
+    assert nx.utils.graphs_equal(view, graph)
+
+def test_edges_are_deduplicated_across_compaction(monkeypatch):
+    monkeypatch.setattr(compact_graph, 'PENDING_EDGE_LIMIT', 2)
+    compact = CompactGraph()
+    compact.add_node('a', category='Reddit')
+    compact.add_edge('a', 'b', relation='Mentions')
+    compact.add_edge('b', 'c', relation='Mentions')
+    compact.add_edge('b', 'a', relation='Contains')
+    compact.add_edge('c', 'c', relation='Contains')
+    compact.add_node('a')
+    assert compact.number_of_edges() == 3
+    assert compact.relation('a', 'b') == 'Contains'
+    assert compact.category('a') == 'Reddit'
+    assert compact.category('b') is None
+    assert dict(compact.degree()) == {'a': 1, 'b': 2, 'c': 3}
+    assert compact.degree_of('c') == 3
+    assert sorted(compact.neighbors('b')) == ['a', 'c']
+    compact.remove_edge('a', 'b')
+    assert not compact.has_edge('a', 'b')
+    assert compact.number_of_edges() == 2
+
+def test_removed_edges_are_buffered_until_compaction():
+    compact = CompactGraph()
+    for node in 'bcd':
+        compact.add_edge('a', node, relation='Mentions')
+    compact.adjacency()
+    keys = compact._edge_keys
+    compact.remove_edge('a', 'b')
+    compact.remove_edge('a', 'c')
+    assert compact._edge_keys is keys
+    assert not compact.has_edge('a', 'b')
+    assert compact.number_of_edges() == 1
+    with pytest.raises(KeyError):
+        compact.remove_edge('a', 'b')
+    compact.add_edge('b', 'a', relation='Contains')
+    assert compact.relation('a', 'b') == 'Contains'
+    assert compact.number_of_edges() == 2
+    assert sorted(compact.edges()) == [('a', 'b'), ('a', 'd')]
+    assert sorted(compact.neighbors('a')) == ['b', 'd']
+
+def test_save_and_load(tmp_path, sample_graph):
+    compact = CompactGraph.from_networkx(sample_graph)
+    path = tmp_path / 'graph.npz'
+    compact.save(path)
+    loaded = load_graph(path)
+    assert nx.utils.graphs_equal(loaded.to_networkx(), compact.to_networkx())
+
+def test_centrality_on_compact_graph_matches_networkx(sample_graph):
+    compact = CompactGraph.from_networkx(sample_graph)
+    graph = nx.relabel_nodes(sample_graph, str)
+    assert dict(DegreeIndex.from_graph(compact).degrees) == dict(graph.degree())
+    assert pagerank(compact) == pytest.approx(pagerank(graph))
+    assert approximate_betweenness(compact) == pytest.approx(nx.betweenness_centrality(graph))
+
+def test_node_names_are_strings(tmp_path):
+    compact = CompactGraph()
+    compact.add_edge(1, 2)
+    compact.add_edge('1', '3')
+    assert compact.number_of_nodes() == 3
+    assert compact.has_edge(1, '2') and 1 in compact
+    with pytest.raises(ValueError):
+        compact.add_node(float('nan'))
+    path = tmp_path / 'graph.npz'
+    compact.save(path)
+    assert sorted(load_graph(path).edges()) == [('1', '2'), ('1', '3')]
+
+def test_compact_degree_index_top_k(sample_graph):
+    compact = CompactGraph.from_networkx(sample_graph)
+    graph = nx.relabel_nodes(sample_graph, str)
+    index = CompactDegreeIndex(compact)
+    expected = DegreeIndex.from_graph(graph)
+    assert index.centrality() == pytest.approx(expected.centrality())
+    top = index.top_k(k=3, categories='Keyword')
+    assert [score for _, score in top] == [score for _, score in expected.top_k(k=3, graph=graph, categories='Keyword')]
+    assert all(compact.category(node) == 'Keyword' for node, _ in top)
+    assert index.top_k(k=3, categories='Unknown') == []
+
+def _query(tmp_path, sample_graph):
+    graph = nx.relabel_nodes(sample_graph, str)
+    graph.add_node('isolated', category='Entity')
+    path = tmp_path / 'graph.npz'
+    CompactGraph.from_networkx(graph).save(path)
+    return graph, KnowledgeGraphQuery(str(path))
+
+def test_query_shortest_path(tmp_path, sample_graph, node_key):
+    graph, query = _query(tmp_path, sample_graph)
+    source, target = str(node_key(16)), str(node_key(25))
+    path = query.shortest_path_query(source, target)
+    assert path[0] == source and path[-1] == target
+    assert len(path) == nx.shortest_path_length(graph, source, target) + 1
+    assert all(graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+    assert query.shortest_path_query(str(node_key(0)), 'isolated') == []
+    assert query.shortest_path_query(str(node_key(0)), str(node_key(0))) == [str(node_key(0))]
+
+def test_query_relations_update_degrees(tmp_path, sample_graph, node_key):
+    graph, query = _query(tmp_path, sample_graph)
+    first, second = str(node_key(0)), str(node_key(1))
+    query.add_relation('isolated', 'new node', 'Mentions', {'new node': 'Keyword'})
+    query.add_relation('isolated', 'new node', 'Contains')
+    query.add_relation('isolated', first, 'Mentions')
+    query.remove_relation(first, second)
+    query.remove_relation(first, 'missing')
+    graph.add_edge('isolated', 'new node')
+    graph.add_edge('isolated', first)
+    graph.remove_edge(first, second)
+    assert query.degree_index.centrality() == pytest.approx(nx.degree_centrality(graph))
+    assert query.graph.category('new node') == 'Keyword'
+    keywords = dict(query.centrality_query(k=50, categories='Keyword'))
+    assert keywords['new node'] == pytest.approx(1 / 35)
+    assert 'isolated' not in keywords
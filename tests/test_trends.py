@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts.trends import chunk_keywords, combine_anchored_frames, rolling_stats, TrendStore
+
+def _window(start, periods, data):
+    index = pd.date_range(start, periods=periods, freq='h', name='date')
+    return pd.DataFrame(data, index=index)
+
+def test_chunk_keywords_shares_anchor():
+    chunks = chunk_keywords(['AWS', 'Azure', 'GCP', 'IBM Cloud', 'Alibaba Cloud', 'Oracle Cloud', 'AWS'], 'AWS')
+    assert chunks == [['AWS', 'Azure', 'GCP', 'IBM Cloud', 'Alibaba Cloud'], ['AWS', 'Oracle Cloud']]
+    assert chunk_keywords(['AWS'], 'AWS') == [['AWS']]
+
+def test_combine_anchored_frames_rescales_onto_first_payload():
+    first = _window('2024-01-01', 3, {'AWS': [50, 50, 50], 'Azure': [20, 40, 60], 'isPartial': [False, False, True]})
+    second = _window('2024-01-01', 3, {'AWS': [100, 100, 100], 'GCP': [10, 20, 30], 'isPartial': [False, False, False]})
+    combined = combine_anchored_frames([first, second], 'AWS')
+    assert list(combined.columns) == ['AWS', 'Azure', 'GCP', 'isPartial']
+    assert combined['GCP'].tolist() == [5, 10, 15]
+    assert combined['isPartial'].tolist() == [False, False, True]
+
+def test_rolling_stats_incremental_matches_full_history():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(1, 100, 200)
+    values[150] = 1000
+    window = 24
+    full = rolling_stats([], values, window=window)
+    incremental = rolling_stats(values[:120], values[120:], window=window)
+    for name in ('pct_change', 'moving_average', 'zscore'):
+        assert incremental[name] == pytest.approx(full[name][120:])
+
+    series = pd.Series(values)
+    assert full['moving_average'] == pytest.approx(series.rolling(window, min_periods=1).mean().to_numpy())
+    assert full['pct_change'][1:] == pytest.approx(series.pct_change().to_numpy()[1:])
+    previous = series.shift(1).rolling(window, min_periods=2)
+    expected_z = ((series - previous.mean()) / previous.std(ddof=0)).fillna(0).to_numpy()
+    assert full['zscore'] == pytest.approx(expected_z)
+    assert np.flatnonzero(full['spike']).tolist() == [150]
+
+def test_trend_store_merges_overlapping_windows(tmp_path):
+    path = tmp_path / 'series.csv'
+    store = TrendStore(path, window=4)
+    first = store.merge_window(_window('2024-01-01', 4, {'AWS': [10, 20, 30, 40], 'isPartial': [False] * 3 + [True]}))
+    assert first['value'].tolist() == [10, 20, 30]
+
+    # The new window is normalized differently: its overlap is twice the stored values
+    second = store.merge_window(_window('2024-01-01 01:00', 4, {'AWS': [40, 60, 80, 100]}))
+    assert second['date'].tolist() == list(pd.date_range('2024-01-01 03:00', periods=2, freq='h'))
+    assert second['value'].tolist() == [40, 50]
+    assert second['moving_average'].tolist() == pytest.approx([25, 35])
+
+    assert store.merge_window(_window('2024-01-01', 2, {'AWS': [10, 20]})).empty
+    reloaded = TrendStore(path)
+    assert reloaded.series('AWS').tolist() == [10, 20, 30, 40, 50]
+
+def test_trend_store_rescales_new_keywords_with_the_window(tmp_path):
+    store = TrendStore(tmp_path / 'series.csv')
+    store.merge_window(_window('2024-01-01', 3, {'AWS': [10, 20, 30]}))
+    appended = store.merge_window(_window('2024-01-01 01:00', 3, {'AWS': [40, 60, 80], 'GCP': [40, 60, 80]}))
+    latest = appended[appended['date'] == pd.Timestamp('2024-01-01 03:00')].set_index('keyword')['value']
+    assert latest['AWS'] == pytest.approx(40)
+    assert latest['GCP'] == pytest.approx(40)
+    assert store.series('GCP').tolist() == pytest.approx([20, 30, 40])
+
+def test_zero_overlap_does_not_zero_the_window(tmp_path):
+    store = TrendStore(tmp_path / 'series.csv')
+    store.merge_window(_window('2024-01-01', 4, {'AWS': [100, 0, 0, 0]}))
+    second = store.merge_window(_window('2024-01-01 01:00', 5, {'AWS': [50, 60, 70, 80, 100]}))
+    assert second['value'].tolist() == [80, 100]
+    third = store.merge_window(_window('2024-01-01 04:00', 4, {'AWS': [40, 50, 60, 70]}))
+    assert third['value'].tolist() == [120, 140]
+
+def test_combine_anchored_frames_ignores_zero_reference():
+    first = _window('2024-01-01', 2, {'AWS': [0, 0], 'Azure': [20, 40]})
+    second = _window('2024-01-01', 2, {'AWS': [10, 10], 'GCP': [10, 20]})
+    assert combine_anchored_frames([first, second], 'AWS')['GCP'].tolist() == [10, 20]
+
+def test_trend_store_skips_merged_and_stale_windows(tmp_path):
+    path = tmp_path / 'series.csv'
+    store = TrendStore(path)
+    store.merge_window(_window('2024-01-01', 3, {'AWS': [10, 20, 30]}), source='google_trends_1.csv')
+    assert store.has_merged('google_trends_1.csv')
+    assert TrendStore(path).has_merged('google_trends_1.csv')
+    assert not store.has_merged('google_trends_2.csv')
+    assert store.merge_window(_window('2024-01-01', 2, {'AWS': [50, 60]})).empty
+    # A stale window still adds keywords the store has not seen
+    assert store.merge_window(_window('2024-01-01', 2, {'AWS': [10, 20], 'GCP': [5, 10]}))['keyword'].tolist() == ['GCP', 'GCP']